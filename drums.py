@@ -1,32 +1,55 @@
 import contextlib
 import leap
 import time
-import mido
+import rtmidi
 import threading
 import queue
+import signal
+import sys
 
 # --- Configuration ---
-MIDI_PORT_NAME      = 'USB MIDI Interface 1'  # ← exact string from mido.get_output_names()
+MIDI_PORT_NAME      = 'USB MIDI Interface 1'  # ← exact string from midi_check.py
 ENABLE_DEBUG_PRINTS = False                   # ← turn off for performance
 
+# Max gesture-processing rate per device (Hz); earlier frames are skipped
+MAX_TRACKING_HZ    = 60
+_FRAME_INTERVAL_NS = 1_000_000_000 // MAX_TRACKING_HZ
+
 # Zone / play area (mm)
 X_RANGE = [-200, 200]
 Z_RANGE = [-200, 200]
 Y_MIN   = 100
 
+# Unpacked once so the per-frame zone test compares plain numbers.
+_X_MIN, _X_MAX = X_RANGE
+_Z_MIN, _Z_MAX = Z_RANGE
+
 # Strike detection (drum channels only)
 DOWNWARD_STRIKE_THRESHOLD = 45.0
 OPEN_HAND_THRESHOLD       = 0.15
 RETRIGGER_COOLDOWN        = 0.1304
 MAX_VELOCITY              = 127
 
+# Cooldown as integer nanoseconds: strikes compare time.monotonic_ns() against a
+# per-hand deadline, which is immune to wall-clock adjustments.
+_RETRIGGER_COOLDOWN_NS = int(RETRIGGER_COOLDOWN * 1e9)
+
+# MIDI status bytes (high nibble; low nibble is the 0-indexed channel)
+_NOTE_ON        = 0x90
+_NOTE_OFF       = 0x80
+_CONTROL_CHANGE = 0xB0
+
+# Gap between a drum note_on and its automatic note_off. Every hit needs its
+# own note_off or the Syntakt holds the voice open (see CLAUDE.md).
+_AUTO_NOTE_OFF_DELAY = 0.05
+
 # Per-player Syntakt track/channel mapping.
 #
 # 'tonal': False  →  drum/impulse mode: fires a 50ms note_on/note_off on downward strike
 # 'tonal': True   →  sustain mode: holds note_on while hand is open in zone,
 #                    releases note_off when hand closes, leaves zone, or disappears
 #
-# mido channels are 0-indexed (channel 0 = Syntakt MIDI Ch 1)
+# Channels are the 0-indexed low nibble of the status byte (channel 0 = Syntakt MIDI Ch 1)
 PLAYER_TRACK_CONFIG = {
     1: [
         {'channel': 0,  'note': 60, 'name': 'Kick',   'tonal': False},
@@ -48,6 +71,19 @@ PLAYER_TRACK_CONFIG = {
     ],
 }
 
+# Every quadrant always sends the same note, so encode its messages once up front.
+for _quads in PLAYER_TRACK_CONFIG.values():
+    for _cfg in _quads:
+        _cfg['note_on']  = bytes((_NOTE_ON  | _cfg['channel'], _cfg['note'], MAX_VELOCITY))
+        _cfg['note_off'] = bytes((_NOTE_OFF | _cfg['channel'], _cfg['note'], 0))
+
+# Each player's per-quadrant 'tonal' flags as a tuple: the hand loop checks the
+# quadrant's mode every frame, and a tuple index beats a dict lookup on the cfg.
+_PLAYER_TONAL: dict[int, tuple[bool, ...]] = {
+    player: tuple(cfg['tonal'] for cfg in quads)
+    for player, quads in PLAYER_TRACK_CONFIG.items()
+}
+
 
 # ---------------------------------------------------------------------------
 # Hand State
@@ -55,14 +91,14 @@ PLAYER_TRACK_CONFIG = {
 
 class HandState:
     """
-    Per-hand tracking state. Dict key is (device_id, hand.id).
+    Per-hand tracking state. Stored as hand_states[device_id][hand.id].
 
     is_sustaining: True when a tonal note_on is currently held open on the Syntakt.
     A matching note_off must be sent before this hand is cleaned up or deactivated.
     """
     __slots__ = [
         'hand_id', 'is_active', 'current_quadrant',
-        'last_trigger_height', 'last_trigger_time', 'is_sustaining',
+        'last_trigger_height', 'retrigger_deadline', 'is_sustaining',
     ]
 
     def __init__(self, hand_id):
@@ -70,14 +106,14 @@ class HandState:
         self.is_active           = False
         self.current_quadrant    = None
         self.last_trigger_height = 0.0
-        self.last_trigger_time   = 0.0
+        self.retrigger_deadline  = 0
         self.is_sustaining       = False
 
     def activate(self, quadrant, height):
         self.is_active           = True
         self.current_quadrant    = quadrant
         self.last_trigger_height = height
-        self.last_trigger_time   = time.time()
+        self.retrigger_deadline  = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
 
     def deactivate(self):
         self.is_active        = False
@@ -85,6 +121,23 @@ class HandState:
         self.is_sustaining    = False
 
 
+# ---------------------------------------------------------------------------
+# Debug output
+# ---------------------------------------------------------------------------
+
+# Queued for the printer thread — see "Debug mode" in CLAUDE.md
+_debug_lines: queue.SimpleQueue = queue.SimpleQueue()
+
+
+def _debug(msg: str):
+    _debug_lines.put(msg)
+
+
+def _debug_printer():
+    while True:
+        print(_debug_lines.get())
+
+
 # ---------------------------------------------------------------------------
 # Listener
 # ---------------------------------------------------------------------------
@@ -93,27 +146,45 @@ class DrumCircleListener(leap.Listener):
     """
     Handles up to 3 Ultraleap modules simultaneously.
 
-    MIDI queue items are tuples: (mido.Message, auto_note_off: bool)
-      auto_note_off=True  → sender waits 50ms then sends matching note_off (drums)
+    MIDI queue items are per-frame batches: lists of (midi_bytes, auto_note_off: bool)
+      auto_note_off=True  → sender sends matching note_off 50ms later (drums)
       auto_note_off=False → sender passes message through as-is (tonal note_on/note_off)
     """
 
+    # Every instance attribute — keep in sync with __init__
+    __slots__ = [
+        'port', '_send_bytes', '_device_stack', '_connection',
+        '_device_map', '_device_map_lock', 'hand_states', '_next_frame_ns',
+        '_pending', 'midi_queue', 'midi_thread',
+    ]
+
     def __init__(self, port, device_stack, connection):
         super().__init__()
         self.port          = port
+        self._send_bytes   = port.send_message   # pre-bound rtmidi.MidiOut write
         self._device_stack = device_stack
         self._connection   = connection
 
         self._device_map: dict[int, int] = {}
         self._device_map_lock = threading.Lock()
 
-        self.hand_states: dict[tuple[int, int], HandState] = {}
+        # device_id → {hand.id → HandState}. Hand IDs can collide across
+        # devices, so each device gets its own dict.
+        self.hand_states: dict[int, dict[int, HandState]] = {}
+
+        # device_id → monotonic_ns before which its frames are skipped.
+        self._next_frame_ns: dict[int, int] = {}
+
+        # Messages produced while handling one tracking frame are collected
+        # here and handed to the sender as a single queue item.
+        self._pending: list[tuple[bytes, bool]] = []
 
         self.midi_queue  = queue.Queue(maxsize=200)
         self.midi_thread = threading.Thread(target=self._midi_sender, daemon=True)
         self.midi_thread.start()
 
         if ENABLE_DEBUG_PRINTS:
+            threading.Thread(target=_debug_printer, daemon=True).start()
             print("DrumCircleListener ready — waiting for devices...")
 
     # ------------------------------------------------------------------
@@ -134,27 +205,49 @@ class DrumCircleListener(leap.Listener):
 
     def on_tracking_event(self, event):
         device_id = event.metadata.device_id
-        player    = self._get_player(device_id)
+        # Per-device rate cap (MAX_TRACKING_HZ)
+        now = time.monotonic_ns()
+        due = self._next_frame_ns.get(device_id, 0)
+        if now < due:
+            return
+        due += _FRAME_INTERVAL_NS   # one interval on; resync from now after a gap
+        self._next_frame_ns[device_id] = due if due > now else now + _FRAME_INTERVAL_NS
+
+        player = self._get_player(device_id)
         if player is None:
             return
 
         quad_cfg     = PLAYER_TRACK_CONFIG[player]
-        current_keys = {(device_id, h.id) for h in event.hands}
+        quad_tonal   = _PLAYER_TONAL[player]
+        # This device's hands, keyed by hand.id.
+        hand_states = self.hand_states.get(device_id)
+        if hand_states is None:
+            hand_states = self.hand_states[device_id] = {}
+
+        # Per-frame constants as locals for the hand loop
+        open_thr     = OPEN_HAND_THRESHOLD
+        x_min, x_max = _X_MIN, _X_MAX
+        z_min, z_max = _Z_MIN, _Z_MAX
+        y_min        = Y_MIN
+        current_ids  = set()   # filled in the hand loop — no separate pass
 
         for hand in event.hands:
             pos      = hand.palm.position
-            key      = (device_id, hand.id)
-            in_zone  = self._is_in_play_zone(pos)
-            is_open  = hand.grab_strength < OPEN_HAND_THRESHOLD
-            quadrant = self._get_quadrant(pos) if in_zone else None
-
-            if key not in self.hand_states:
-                self.hand_states[key] = HandState(hand.id)
-            state = self.hand_states[key]
+            x, y, z  = pos.x, pos.y, pos.z
+            hand_id  = hand.id
+            key      = (device_id, hand_id)
+            current_ids.add(hand_id)
+            in_zone  = x_min <= x <= x_max and z_min <= z <= z_max and y >= y_min
+            is_open  = hand.grab_strength < open_thr
+            quadrant = self._get_quadrant(x, z) if in_zone else None
+
+            state = hand_states.get(hand_id)
+            if state is None:
+                state = hand_states[hand_id] = HandState(hand_id)
 
             if not state.is_active:
                 if in_zone and is_open and quadrant:
-                    state.activate(quadrant, pos.y)
+                    state.activate(quadrant, y)
                     self._on_zone_entry(quad_cfg, quadrant, key, state)
 
             elif in_zone and is_open:
@@ -165,9 +258,8 @@ class DrumCircleListener(leap.Listener):
                     state.current_quadrant = quadrant
                     self._on_zone_entry(quad_cfg, quadrant, key, state)
                 elif quadrant:
-                    cfg = quad_cfg[quadrant - 1]
-                    if not cfg['tonal']:
-                        self._check_strike(state, pos.y, quad_cfg, quadrant, key)
+                    if not quad_tonal[quadrant - 1]:
+                        self._check_strike(state, y, quad_cfg, quadrant, key)
 
             else:
                 # Hand closed or left zone
@@ -176,12 +268,13 @@ class DrumCircleListener(leap.Listener):
                 state.deactivate()
 
         # Stale hand cleanup — release any held tonal notes for hands that vanished
-        stale = {k for k in self.hand_states if k[0] == device_id} - current_keys
-        for k in stale:
-            s = self.hand_states[k]
-            if s.is_sustaining:
-                self._release_tonal(quad_cfg, s.current_quadrant, k, s)
-            del self.hand_states[k]
+        if len(hand_states) != len(current_ids):
+            for hand_id in hand_states.keys() - current_ids:
+                s = hand_states.pop(hand_id)
+                if s.is_sustaining:
+                    self._release_tonal(quad_cfg, s.current_quadrant, (device_id, hand_id), s)
+
+        self._flush()
 
     # ------------------------------------------------------------------
     # Helpers
@@ -198,18 +291,11 @@ class DrumCircleListener(leap.Listener):
                 print(f"[Assign] Device {device_id} → Player {n}")
             return self._device_map[device_id]
 
-    def _is_in_play_zone(self, pos) -> bool:
-        return (X_RANGE[0] <= pos.x <= X_RANGE[1] and
-                Z_RANGE[0] <= pos.z <= Z_RANGE[1] and
-                pos.y >= Y_MIN)
-
-    def _get_quadrant(self, pos) -> int | None:
-        if not self._is_in_play_zone(pos):
-            return None
-        if pos.x >= 0 and pos.z >= 0: return 1
-        if pos.x <  0 and pos.z >= 0: return 2
-        if pos.x <  0 and pos.z <  0: return 3
-        return 4
+    def _get_quadrant(self, x: float, z: float) -> int:
+        """Quadrant 1–4 by the signs of x and z. Callers check the play zone first."""
+        if z >= 0:
+            return 1 if x >= 0 else 2
+        return 4 if x >= 0 else 3
 
     # ------------------------------------------------------------------
     # Zone entry — dispatches to tonal or drum behaviour
@@ -219,14 +305,13 @@ class DrumCircleListener(leap.Listener):
         cfg = quad_cfg[quadrant - 1]
         if cfg['tonal']:
             self._queue((
-                mido.Message('note_on', note=cfg['note'],
-                             velocity=MAX_VELOCITY, channel=cfg['channel']),
+                cfg['note_on'],
                 False  # do NOT auto-close — sustain until explicit release
             ))
-            state.is_sustaining     = True
-            state.last_trigger_time = time.time()
+            state.is_sustaining      = True
+            state.retrigger_deadline = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
             if ENABLE_DEBUG_PRINTS:
-                print(f"  SUSTAIN ON  {key} → {cfg['name']} ch={cfg['channel']+1}")
+                _debug(f"  SUSTAIN ON  {key} → {cfg['name']} ch={cfg['channel']+1}")
         else:
             self._fire_drum(cfg, key, state)
 
@@ -237,14 +322,10 @@ class DrumCircleListener(leap.Listener):
         cfg = quad_cfg[quadrant - 1]
         if not cfg['tonal']:
             return
-        self._queue((
-            mido.Message('note_off', note=cfg['note'],
-                         velocity=0, channel=cfg['channel']),
-            False
-        ))
+        self._queue((cfg['note_off'], False))
         state.is_sustaining = False
         if ENABLE_DEBUG_PRINTS:
-            print(f"  SUSTAIN OFF {key} → {cfg['name']} ch={cfg['channel']+1}")
+            _debug(f"  SUSTAIN OFF {key} → {cfg['name']} ch={cfg['channel']+1}")
 
     # ------------------------------------------------------------------
     # Drum strike detection
@@ -255,30 +336,36 @@ class DrumCircleListener(leap.Listener):
             state.last_trigger_height = current_height
             return
         if (state.last_trigger_height - current_height > DOWNWARD_STRIKE_THRESHOLD and
-                time.time() - state.last_trigger_time >= RETRIGGER_COOLDOWN):
+                time.monotonic_ns() >= state.retrigger_deadline):
             self._fire_drum(quad_cfg[quadrant - 1], key, state)
             state.last_trigger_height = current_height
 
     def _fire_drum(self, cfg, key, state):
         self._queue((
-            mido.Message('note_on', note=cfg['note'],
-                         velocity=MAX_VELOCITY, channel=cfg['channel']),
+            cfg['note_on'],
             True  # auto-close after 50ms
         ))
-        state.last_trigger_time = time.time()
+        state.retrigger_deadline = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
         if ENABLE_DEBUG_PRINTS:
-            print(f"  HIT  {key} → {cfg['name']} ch={cfg['channel']+1}")
+            _debug(f"  HIT  {key} → {cfg['name']} ch={cfg['channel']+1}")
 
     # ------------------------------------------------------------------
     # Queue helper
     # ------------------------------------------------------------------
 
     def _queue(self, item):
+        self._pending.append(item)
+
+    def _flush(self):
+        """Hand every message collected for this frame to the sender as one item."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
         try:
-            self.midi_queue.put_nowait(item)
+            self.midi_queue.put_nowait(batch)
         except queue.Full:
             if ENABLE_DEBUG_PRINTS:
-                print("MIDI queue full — dropping message")
+                _debug(f"MIDI queue full — dropping {len(batch)} message(s)")
 
     # ------------------------------------------------------------------
     # MIDI sender thread
@@ -286,66 +373,124 @@ class DrumCircleListener(leap.Listener):
 
     def _midi_sender(self):
         """
-        Each queue item is (mido.Message, auto_note_off: bool).
-        auto_note_off=True  → send note_on, sleep 50ms, send note_off  (drums)
+        Each queue item is one frame's batch of (midi_bytes, auto_note_off: bool).
+        auto_note_off=True  → send note_on, note_off follows 50ms later (drums)
         auto_note_off=False → send message as-is                        (tonal)
         """
+        # rtmidi only takes one short message per send_message call, so a batch
+        # is written message by message through a local-bound writer.
+        send = self._send_bytes
+        # Auto note_offs not yet sent: note_on bytes → monotonic due time.
+        # Scheduling them instead of sleeping after each hit keeps one drum
+        # hit from holding up every message queued behind it for 50 ms.
+        due_offs:  dict[bytes, float] = {}
+        # note_on bytes → matching note_off bytes, built once per distinct note.
+        note_offs: dict[bytes, bytes] = {}
         while True:
+            timeout = 1.0
+            if due_offs:
+                timeout = max(0.0, min(due_offs.values()) - time.monotonic())
             try:
-                item = self.midi_queue.get(timeout=1.0)
-                if item is None:
-                    break
-                msg, auto_note_off = item
-                self.port.send(msg)
-                if auto_note_off and msg.type == 'note_on' and msg.velocity > 0:
-                    time.sleep(0.05)
-                    self.port.send(mido.Message('note_off',
-                        note=msg.note, velocity=0, channel=msg.channel))
+                batch = self.midi_queue.get(timeout=timeout)
             except queue.Empty:
-                continue
+                batch = ()
+            if batch is None:
+                break
+            try:
+                for data, auto_note_off in batch:
+                    if auto_note_off and data[0] & 0xF0 == _NOTE_ON and data[2] > 0:
+                        note_off = note_offs.get(data)
+                        if note_off is None:
+                            note_off = note_offs[data] = bytes(
+                                (_NOTE_OFF | (data[0] & 0x0F), data[1], 0))
+                        # Same note hit again before its off was due (e.g. two
+                        # hands in one zone): close the first hit right before
+                        # the retrigger so every note_on still gets its own off.
+                        if due_offs.pop(data, None) is not None:
+                            send(note_off)
+                        send(data)
+                        due_offs[data] = time.monotonic() + _AUTO_NOTE_OFF_DELAY
+                    else:
+                        send(data)
+                if due_offs:
+                    now = time.monotonic()
+                    for data in [d for d, due in due_offs.items() if due <= now]:
+                        del due_offs[data]
+                        send(note_offs[data])
             except Exception as e:
                 if ENABLE_DEBUG_PRINTS:
-                    print(f"MIDI send error: {e}")
+                    _debug(f"MIDI send error: {e}")
+        # Stopping: close any hit whose off hadn't come due yet.
+        for data in due_offs:
+            try:
+                send(note_offs[data])
+            except Exception:
+                pass
 
     # ------------------------------------------------------------------
     # Shutdown
     # ------------------------------------------------------------------
 
     def shutdown(self):
+        # Stop the sender first: it would otherwise be writing to the port
+        # concurrently with the panic below, and anything still queued is
+        # sent before the all-notes-off instead of after it.
+        self.midi_queue.put(None)
+        self.midi_thread.join(timeout=2.0)
         print("Sending all-notes-off...")
+        all_notes_off = bytearray((_CONTROL_CHANGE, 123, 0))
         for channel in range(12):
+            all_notes_off[0] = _CONTROL_CHANGE | channel
             try:
-                self.port.send(mido.Message('control_change',
-                    channel=channel, control=123, value=0))
+                self._send_bytes(all_notes_off)
             except Exception:
                 pass
-        self.midi_queue.put(None)
-        self.midi_thread.join(timeout=2.0)
 
 
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
+def _open_midi_out(name: str) -> rtmidi.MidiOut:
+    """Open the rtmidi output port called exactly `name`."""
+    midi_out = rtmidi.MidiOut()
+    ports    = midi_out.get_ports()
+    if name not in ports:
+        raise IOError(f"MIDI port {name!r} not found — available: {ports}")
+    midi_out.open_port(ports.index(name))
+    return midi_out
+
+
+# An untimed Event.wait() can't be interrupted by Ctrl+C on Windows, so the main
+# thread wakes briefly there to let the SIGINT handler run.
+_STOP_POLL = 1.0 if sys.platform == 'win32' else None
+
+
 def main():
     listener = None
+    port     = None
     try:
-        with mido.open_output(MIDI_PORT_NAME) as port:
-            print(f"MIDI port : {port.name}")
-            print(f"Debug     : {'ON' if ENABLE_DEBUG_PRINTS else 'OFF'}")
-            print("Waiting for Ultraleap devices...\n")
-
-            device_stack = contextlib.ExitStack()
-            connection   = leap.Connection(multi_device_aware=True)
-            listener     = DrumCircleListener(port, device_stack, connection)
-            connection.add_listener(listener)
-
-            with device_stack:
-                with connection.open():
-                    connection.set_tracking_mode(leap.TrackingMode.Desktop)
-                    print("Ready — Ctrl+C to exit\n")
-                    while True:
-                        time.sleep(1)
+        port = _open_midi_out(MIDI_PORT_NAME)
+        print(f"MIDI port : {MIDI_PORT_NAME}")
+        print(f"Debug     : {'ON' if ENABLE_DEBUG_PRINTS else 'OFF'}")
+        print("Waiting for Ultraleap devices...\n")
+
+        device_stack = contextlib.ExitStack()
+        connection   = leap.Connection(multi_device_aware=True)
+        listener     = DrumCircleListener(port, device_stack, connection)
+        connection.add_listener(listener)
+
+        with device_stack:
+            with connection.open():
+                connection.set_tracking_mode(leap.TrackingMode.Desktop)
+                stop = threading.Event()
+                # Ctrl+C just sets the event, so the device stack and the
+                # connection close in order before listener.shutdown().
+                signal.signal(signal.SIGINT, lambda *_: stop.set())
+                print("Ready — Ctrl+C to exit\n")
+                while not stop.wait(_STOP_POLL):
+                    pass
+                print("\nShutting down...")
 
     except KeyboardInterrupt:
         print("\nShutting down...")
@@ -354,8 +499,12 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        # Shut down before closing the port so the all-notes-off panic
+        # actually reaches the Syntakt.
         if listener:
             listener.shutdown()
+        if port is not None:
+            port.close_port()
 
 
 if __name__ == "__main__":
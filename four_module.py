@@ -36,33 +36,56 @@ SYNTAKT SETUP
 import contextlib
 import leap
 import time
-import mido
+import rtmidi
 import threading
 import queue
+import signal
+import sys
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 
-MIDI_PORT_NAME      = 'USB MIDI Interface 1'   # ← exact string from mido.get_output_names()
+MIDI_PORT_NAME      = 'USB MIDI Interface 1'   # ← exact string from midi_check.py
 ENABLE_DEBUG_PRINTS = False
 
+# Max gesture-processing rate per device (Hz); earlier frames are skipped
+MAX_TRACKING_HZ    = 60
+_FRAME_INTERVAL_NS = 1_000_000_000 // MAX_TRACKING_HZ
+
 # Play zone (mm, relative to each module's center)
 X_RANGE = [-400, 400]
 Z_RANGE = [-400, 400]
 Y_MIN   = 50   # hands below this height are ignored
 
+# Unpacked once so the per-frame zone test compares plain numbers.
+_X_MIN, _X_MAX = X_RANGE
+_Z_MIN, _Z_MAX = Z_RANGE
+
 # Drum strike detection
 DOWNWARD_STRIKE_THRESHOLD = 45.0    # mm drop from peak to fire a hit
 OPEN_HAND_THRESHOLD       = 0.15    # grab_strength below this = open hand
 RETRIGGER_COOLDOWN        = 0.119  # seconds — minimum time between hits on same channel
 MAX_VELOCITY              = 127
 
+# Cooldown as integer nanoseconds: strikes compare time.monotonic_ns() against a
+# per-hand deadline, which is immune to wall-clock adjustments.
+_RETRIGGER_COOLDOWN_NS = int(RETRIGGER_COOLDOWN * 1e9)
+
+# MIDI status bytes (high nibble; low nibble is the 0-indexed channel)
+_NOTE_ON        = 0x90
+_NOTE_OFF       = 0x80
+_CONTROL_CHANGE = 0xB0
+
+# Gap between a drum note_on and its automatic note_off. Every hit needs its
+# own note_off or the Syntakt holds the voice open (see CLAUDE.md).
+_AUTO_NOTE_OFF_DELAY = 0.05
+
 # ---------------------------------------------------------------------------
 # Module 1, 2, 4 — 2-zone drum configs
 # Zone 0 = left  (x < 0)
 # Zone 1 = right (x >= 0)
-# mido channels are 0-indexed: channel=0 → Syntakt MIDI Ch 1
+# Channels are the 0-indexed low nibble of the status byte: channel=0 → Syntakt MIDI Ch 1
 # ---------------------------------------------------------------------------
 
 MODULE_DRUM_CONFIG: dict[int, list[dict]] = {
@@ -80,34 +103,63 @@ MODULE_DRUM_CONFIG: dict[int, list[dict]] = {
     ],
 }
 
+# Every drum zone sends the same note_on on each hit, so encode it once up front.
+for _zones in MODULE_DRUM_CONFIG.values():
+    for _cfg in _zones:
+        _cfg['note_on'] = bytes((_NOTE_ON | _cfg['channel'], _cfg['note'], MAX_VELOCITY))
+
 # ---------------------------------------------------------------------------
 # Module 3 — drum channel (left side) + synth channel (right side)
 # ---------------------------------------------------------------------------
 
-M3_DRUM_CHANNEL  = 5    # mido 5 → Syntakt Ch 6
+M3_DRUM_CHANNEL  = 5    # channel 5 → Syntakt Ch 6
 M3_DRUM_NOTE     = 60
+_M3_DRUM_NOTE_ON = bytes((_NOTE_ON | M3_DRUM_CHANNEL, M3_DRUM_NOTE, MAX_VELOCITY))
 
-M3_SYNTH_CHANNEL = 7    # mido 7 → Syntakt Ch 8
+M3_SYNTH_CHANNEL = 7    # channel 7 → Syntakt Ch 8
 
 # C-minor blues scale: C, Eb, F, F#, G, Bb  (semitone intervals from root)
-_BLUES_INTERVALS: list[int] = [0, 3, 5, 6, 7, 10]
+_BLUES_INTERVALS: tuple[int, ...] = (0, 3, 5, 6, 7, 10)
 _SYNTH_ROOT_MIDI = 60   # C4
 _SYNTH_OCTAVES   = 2    # two octaves: C4 through C6
 
-# Build ordered ascending list of all synth notes across the 2-octave range.
+# Build ordered ascending tuple of all synth notes across the 2-octave range.
 # Octave 0 → C4, Eb4, F4, F#4, G4, Bb4
 # Octave 1 → C5, Eb5, F5, F#5, G5, Bb5
 # Top note  → C6
-SYNTH_NOTES: list[int] = []
-for _oct in range(_SYNTH_OCTAVES):
-    for _iv in _BLUES_INTERVALS:
-        SYNTH_NOTES.append(_SYNTH_ROOT_MIDI + _oct * 12 + _iv)
-SYNTH_NOTES.append(_SYNTH_ROOT_MIDI + _SYNTH_OCTAVES * 12)   # C6 = MIDI 84
+SYNTH_NOTES: tuple[int, ...] = tuple(
+    _SYNTH_ROOT_MIDI + _oct * 12 + _iv
+    for _oct in range(_SYNTH_OCTAVES)
+    for _iv in _BLUES_INTERVALS
+) + (_SYNTH_ROOT_MIDI + _SYNTH_OCTAVES * 12,)   # C6 = MIDI 84
 # Final list (13 notes): [60,63,65,66,67,70, 72,75,77,78,79,82, 84]
 
+# Encoded synth note_on / note_off for every scale note, looked up by note.
+_SYNTH_NOTE_ON:  dict[int, bytes] = {
+    n: bytes((_NOTE_ON | M3_SYNTH_CHANNEL, n, MAX_VELOCITY)) for n in SYNTH_NOTES
+}
+_SYNTH_NOTE_OFF: dict[int, bytes] = {
+    n: bytes((_NOTE_OFF | M3_SYNTH_CHANNEL, n, 0)) for n in SYNTH_NOTES
+}
+
 # Maximum |z| value within the play zone — used to normalise the pitch mapping.
 _MAX_Z_DIST = float(max(abs(Z_RANGE[0]), abs(Z_RANGE[1])))   # 200.0 mm
 
+# Synth note for every whole mm of |z| out to _MAX_Z_DIST, so _z_to_note is a
+# single index into a table built at import.
+_Z_NOTE_SCALE = (len(SYNTH_NOTES) - 1) / _MAX_Z_DIST
+_Z_NOTE_MAX_I = len(SYNTH_NOTES) - 1
+_Z_NOTE_LUT: tuple[int, ...] = tuple(
+    SYNTH_NOTES[round(_Z_NOTE_MAX_I - mm * _Z_NOTE_SCALE)]
+    for mm in range(int(_MAX_Z_DIST) + 1)
+)
+_Z_NOTE_LUT_MAX = len(_Z_NOTE_LUT) - 1
+
+# Synth re-pitch deadband: |z| must travel this far (mm) past a note band's
+# edge before the held note changes, so a hand resting on a boundary doesn't
+# flap between two notes every frame.
+NOTE_HYSTERESIS = 5.0
+
 _NOTE_NAMES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
 
 
@@ -120,10 +172,20 @@ def _z_to_note(z: float) -> int:
 
     X and Y have no effect on pitch.
     """
-    z_dist = min(abs(z), _MAX_Z_DIST)
-    ratio  = 1.0 - z_dist / _MAX_Z_DIST   # 1.0 at center, 0.0 at far edge
-    idx    = round(ratio * (len(SYNTH_NOTES) - 1))
-    return SYNTH_NOTES[idx]
+    # |z| is never negative, so only the far edge needs clamping.
+    idx = int(abs(z))
+    return _Z_NOTE_LUT[_Z_NOTE_LUT_MAX if idx > _Z_NOTE_LUT_MAX else idx]
+
+
+def _z_note_moved(z: float, current_note: int | None) -> bool:
+    """True once |z| is NOTE_HYSTERESIS mm past the edge of current_note's band."""
+    new_note = _z_to_note(z)
+    if current_note is None or new_note == current_note:
+        return new_note != current_note
+    # Notes rise toward the module center — look back toward the band the
+    # hand came from (farther out if the note went up, closer in if down).
+    back = NOTE_HYSTERESIS if new_note > current_note else -NOTE_HYSTERESIS
+    return _z_to_note(abs(z) + back) != current_note
 
 
 # ---------------------------------------------------------------------------
@@ -134,7 +196,7 @@ class TwoZoneHandState:
     """Per-hand state for 2-zone drum modules (modules 1, 2, 4)."""
     __slots__ = [
         'hand_id', 'is_active', 'current_zone',
-        'last_trigger_height', 'last_trigger_time',
+        'last_trigger_height', 'retrigger_deadline',
     ]
 
     def __init__(self, hand_id: int):
@@ -142,13 +204,13 @@ class TwoZoneHandState:
         self.is_active           = False
         self.current_zone        = None   # 0 = left, 1 = right
         self.last_trigger_height = 0.0
-        self.last_trigger_time   = 0.0
+        self.retrigger_deadline  = 0
 
     def activate(self, zone: int, height: float):
         self.is_active           = True
         self.current_zone        = zone
         self.last_trigger_height = height
-        self.last_trigger_time   = time.time()
+        self.retrigger_deadline  = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
 
     def deactivate(self):
         self.is_active    = False
@@ -172,7 +234,7 @@ class Module3HandState:
     __slots__ = [
         'hand_id', 'is_active', 'current_side',
         'is_sustaining', 'current_synth_note',
-        'last_trigger_height', 'last_trigger_time',
+        'last_trigger_height', 'retrigger_deadline',
     ]
 
     def __init__(self, hand_id: int):
@@ -182,13 +244,13 @@ class Module3HandState:
         self.is_sustaining       = False
         self.current_synth_note  = None
         self.last_trigger_height = 0.0
-        self.last_trigger_time   = 0.0
+        self.retrigger_deadline  = 0
 
     def activate(self, side: int, height: float):
         self.is_active           = True
         self.current_side        = side
         self.last_trigger_height = height
-        self.last_trigger_time   = time.time()
+        self.retrigger_deadline  = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
 
     def deactivate(self):
         self.is_active          = False
@@ -197,6 +259,23 @@ class Module3HandState:
         self.current_synth_note = None
 
 
+# ---------------------------------------------------------------------------
+# Debug output
+# ---------------------------------------------------------------------------
+
+# Queued for the printer thread — see "Debug mode" in CLAUDE.md
+_debug_lines: queue.SimpleQueue = queue.SimpleQueue()
+
+
+def _debug(msg: str):
+    _debug_lines.put(msg)
+
+
+def _debug_printer():
+    while True:
+        print(_debug_lines.get())
+
+
 # ---------------------------------------------------------------------------
 # Listener
 # ---------------------------------------------------------------------------
@@ -206,14 +285,25 @@ class FourModuleListener(leap.Listener):
     Handles up to 4 Ultraleap modules simultaneously.
     Devices are assigned player roles 1–4 in first-seen order.
 
-    MIDI queue items are tuples: (mido.Message, auto_note_off: bool)
-      auto_note_off=True  → sender fires note_on, sleeps 50 ms, sends note_off  (drums)
+    MIDI queue items are per-frame batches: lists of (midi_bytes, auto_note_off: bool)
+      auto_note_off=True  → sender fires note_on, sends note_off 50 ms later   (drums)
       auto_note_off=False → sender passes message through unchanged              (synth)
+    A batch is queued (or dropped, if the queue is full) as a unit, so a
+    note_off/note_on re-pitch pair can never be split by a queue drop.
     """
 
+    # Every instance attribute — keep in sync with __init__
+    __slots__ = [
+        'port', '_send_bytes', '_device_stack', '_connection',
+        '_device_map', '_device_map_lock', '_serial_to_player', '_device_serials',
+        '_opened_device_ids', '_player_last_seen', '_next_frame_ns',
+        '_drum_states', '_m3_states', '_pending', 'midi_queue', 'midi_thread',
+    ]
+
     def __init__(self, port, device_stack, connection):
         super().__init__()
         self.port          = port
+        self._send_bytes   = port.send_message   # pre-bound rtmidi.MidiOut write
         self._device_stack = device_stack
         self._connection   = connection
 
@@ -234,16 +324,24 @@ class FourModuleListener(leap.Listener):
         # player → time of last tracking event (for health diagnostics).
         self._player_last_seen: dict[int, float] = {}
 
-        # Hand state dicts keyed by (device_id, hand.id).
-        # IDs can collide across devices — the tuple prevents confusion.
-        self._drum_states: dict[tuple, TwoZoneHandState] = {}
-        self._m3_states:   dict[tuple, Module3HandState] = {}
+        # device_id → monotonic_ns before which its frames are skipped.
+        self._next_frame_ns: dict[int, int] = {}
+
+        # Hand state dicts: device_id → {hand.id → state}.
+        # IDs can collide across devices — the per-device dict keeps them apart.
+        self._drum_states: dict[int, dict[int, TwoZoneHandState]] = {}
+        self._m3_states:   dict[int, dict[int, Module3HandState]] = {}
+
+        # Messages produced while handling one tracking frame (or one device loss)
+        # are collected here and handed to the sender as a single queue item.
+        self._pending: list[tuple[bytes, bool]] = []
 
         self.midi_queue  = queue.Queue(maxsize=200)
         self.midi_thread = threading.Thread(target=self._midi_sender, daemon=True)
         self.midi_thread.start()
 
         if ENABLE_DEBUG_PRINTS:
+            threading.Thread(target=_debug_printer, daemon=True).start()
             print("FourModuleListener initialised — waiting for devices...")
 
     # ------------------------------------------------------------------
@@ -303,20 +401,19 @@ class FourModuleListener(leap.Listener):
 
         with self._device_map_lock:
             self._opened_device_ids.discard(device_id)
+            self._next_frame_ns.pop(device_id, None)
             player = self._device_map.pop(device_id, None)
 
         # Release any sustained synth notes for hands belonging to this device
         # before the tracking events stop arriving.
-        stale_m3 = {k: s for k, s in self._m3_states.items() if k[0] == device_id}
-        for k, s in stale_m3.items():
+        for hand_id, s in self._m3_states.pop(device_id, {}).items():
             if s.is_sustaining:
-                self._m3_close_synth(k, s)
-            del self._m3_states[k]
+                self._m3_close_synth((device_id, hand_id), s)
+        self._flush()
 
         # Clean up drum hand states for this device (prevents memory accumulation
         # across multiple reconnect cycles during a long session).
-        for k in [k for k in self._drum_states if k[0] == device_id]:
-            del self._drum_states[k]
+        self._drum_states.pop(device_id, None)
 
         if player is not None:
             print(f"[Device] id={device_id} LOST (was Player {player}) — "
@@ -369,7 +466,15 @@ class FourModuleListener(leap.Listener):
 
     def on_tracking_event(self, event):
         device_id = event.metadata.device_id
-        player    = self._get_player(device_id)
+        # Per-device rate cap (MAX_TRACKING_HZ)
+        now = time.monotonic_ns()
+        due = self._next_frame_ns.get(device_id, 0)
+        if now < due:
+            return
+        due += _FRAME_INTERVAL_NS   # one interval on; resync from now after a gap
+        self._next_frame_ns[device_id] = due if due > now else now + _FRAME_INTERVAL_NS
+
+        player = self._get_player(device_id)
         if player is None:
             return
 
@@ -379,6 +484,7 @@ class FourModuleListener(leap.Listener):
             self._process_module3(device_id, event.hands)
         else:
             self._process_2zone_drum(device_id, event.hands, MODULE_DRUM_CONFIG[player])
+        self._flush()
 
     def print_health(self):
         """Print which players are actively receiving tracking events."""
@@ -407,67 +513,93 @@ class FourModuleListener(leap.Listener):
     # ------------------------------------------------------------------
 
     def _process_2zone_drum(self, device_id: int, hands, config: list):
-        current_keys = {(device_id, h.id) for h in hands}
+        # This device's hands, keyed by hand.id.
+        drum_states = self._drum_states.get(device_id)
+        if drum_states is None:
+            drum_states = self._drum_states[device_id] = {}
+
+        # Per-frame constants as locals for the hand loop
+        open_thr     = OPEN_HAND_THRESHOLD
+        x_min, x_max = _X_MIN, _X_MAX
+        z_min, z_max = _Z_MIN, _Z_MAX
+        y_min        = Y_MIN
+        current_ids  = set()   # filled in the hand loop — no separate pass
 
         for hand in hands:
             pos     = hand.palm.position
-            key     = (device_id, hand.id)
-            in_zone = self._in_zone(pos)
-            is_open = hand.grab_strength < OPEN_HAND_THRESHOLD
-            zone    = self._x_zone(pos) if in_zone else None   # 0=left, 1=right
-
-            if key not in self._drum_states:
-                self._drum_states[key] = TwoZoneHandState(hand.id)
-            state = self._drum_states[key]
+            x, y, z = pos.x, pos.y, pos.z
+            hand_id = hand.id
+            key     = (device_id, hand_id)
+            current_ids.add(hand_id)
+            in_zone = x_min <= x <= x_max and z_min <= z <= z_max and y >= y_min
+            is_open = hand.grab_strength < open_thr
+            zone    = (0 if x < 0 else 1) if in_zone else None   # 0=left, 1=right
+
+            state = drum_states.get(hand_id)
+            if state is None:
+                state = drum_states[hand_id] = TwoZoneHandState(hand_id)
 
             if not state.is_active:
                 if in_zone and is_open and zone is not None:
-                    state.activate(zone, pos.y)
+                    state.activate(zone, y)
                     self._fire_drum(config[zone], key, state)
 
             elif in_zone and is_open:
                 if zone is not None and zone != state.current_zone:
                     # Hand crossed the center line — entry hit in new zone
                     state.current_zone        = zone
-                    state.last_trigger_height = pos.y
+                    state.last_trigger_height = y
                     self._fire_drum(config[zone], key, state)
                 elif zone is not None:
-                    self._check_strike(state, pos.y, config[zone], key)
+                    self._check_strike(state, y, config[zone], key)
 
             else:
                 # Hand closed or left zone
                 state.deactivate()
 
         # Clean up hands that left the sensor frame
-        stale = {k for k in self._drum_states if k[0] == device_id} - current_keys
-        for k in stale:
-            del self._drum_states[k]
+        if len(drum_states) != len(current_ids):
+            for hand_id in drum_states.keys() - current_ids:
+                del drum_states[hand_id]
 
     # ------------------------------------------------------------------
     # Module 3 — left side = drum, right side = synth
     # ------------------------------------------------------------------
 
     def _process_module3(self, device_id: int, hands):
-        current_keys = {(device_id, h.id) for h in hands}
+        # This device's hands, keyed by hand.id.
+        m3_states = self._m3_states.get(device_id)
+        if m3_states is None:
+            m3_states = self._m3_states[device_id] = {}
+
+        # Per-frame constants as locals for the hand loop
+        open_thr     = OPEN_HAND_THRESHOLD
+        x_min, x_max = _X_MIN, _X_MAX
+        z_min, z_max = _Z_MIN, _Z_MAX
+        y_min        = Y_MIN
+        current_ids  = set()   # filled in the hand loop — no separate pass
 
         for hand in hands:
             pos     = hand.palm.position
-            key     = (device_id, hand.id)
-            in_zone = self._in_zone(pos)
-            is_open = hand.grab_strength < OPEN_HAND_THRESHOLD
-            side    = self._x_zone(pos) if in_zone else None   # 0=left/drum, 1=right/synth
-
-            if key not in self._m3_states:
-                self._m3_states[key] = Module3HandState(hand.id)
-            state = self._m3_states[key]
+            x, y, z = pos.x, pos.y, pos.z
+            hand_id = hand.id
+            key     = (device_id, hand_id)
+            current_ids.add(hand_id)
+            in_zone = x_min <= x <= x_max and z_min <= z <= z_max and y >= y_min
+            is_open = hand.grab_strength < open_thr
+            side    = (0 if x < 0 else 1) if in_zone else None   # 0=left/drum, 1=right/synth
+
+            state = m3_states.get(hand_id)
+            if state is None:
+                state = m3_states[hand_id] = Module3HandState(hand_id)
 
             if not state.is_active:
                 if in_zone and is_open and side is not None:
-                    state.activate(side, pos.y)
+                    state.activate(side, y)
                     if side == 0:
                         self._m3_fire_drum(key, state)
                     else:
-                        self._m3_open_synth(_z_to_note(pos.z), key, state)
+                        self._m3_open_synth(_z_to_note(z), key, state)
 
             elif in_zone and is_open:
                 if side is not None and side != state.current_side:
@@ -475,22 +607,21 @@ class FourModuleListener(leap.Listener):
                     if state.is_sustaining:
                         self._m3_close_synth(key, state)
                     state.current_side        = side
-                    state.last_trigger_height = pos.y
+                    state.last_trigger_height = y
                     if side == 0:
                         self._m3_fire_drum(key, state)
                     else:
-                        self._m3_open_synth(_z_to_note(pos.z), key, state)
+                        self._m3_open_synth(_z_to_note(z), key, state)
 
                 elif side == 0:
                     # Left / drum side — check for downward strike
-                    self._check_strike_m3(state, pos.y, key)
+                    self._check_strike_m3(state, y, key)
 
                 elif side == 1:
                     # Right / synth side — update pitch if Z moved to a different note
-                    new_note = _z_to_note(pos.z)
-                    if new_note != state.current_synth_note:
+                    if _z_note_moved(z, state.current_synth_note):
                         self._m3_close_synth(key, state)
-                        self._m3_open_synth(new_note, key, state)
+                        self._m3_open_synth(_z_to_note(z), key, state)
 
             else:
                 # Hand closed fist or left play zone
@@ -499,19 +630,17 @@ class FourModuleListener(leap.Listener):
                 state.deactivate()
 
         # Clean up — release any synth note for hands that vanished from the frame
-        stale = {k for k in self._m3_states if k[0] == device_id} - current_keys
-        for k in stale:
-            s = self._m3_states[k]
-            if s.is_sustaining:
-                self._m3_close_synth(k, s)
-            del self._m3_states[k]
+        if len(m3_states) != len(current_ids):
+            for hand_id in m3_states.keys() - current_ids:
+                s = m3_states.pop(hand_id)
+                if s.is_sustaining:
+                    self._m3_close_synth((device_id, hand_id), s)
 
     # -- Module 3 synth helpers ------------------------------------------
 
     def _m3_open_synth(self, note: int, key: tuple, state: Module3HandState):
         self._enqueue(
-            mido.Message('note_on', note=note, velocity=MAX_VELOCITY,
-                         channel=M3_SYNTH_CHANNEL),
+            _SYNTH_NOTE_ON[note],
             auto_note_off=False   # sustained — explicit release via _m3_close_synth
         )
         state.is_sustaining      = True
@@ -519,30 +648,28 @@ class FourModuleListener(leap.Listener):
         if ENABLE_DEBUG_PRINTS:
             name = _NOTE_NAMES[note % 12]
             oct  = note // 12 - 1
-            print(f"  SYNTH ON  {key} → {name}{oct} (MIDI {note}) ch={M3_SYNTH_CHANNEL + 1}")
+            _debug(f"  SYNTH ON  {key} → {name}{oct} (MIDI {note}) ch={M3_SYNTH_CHANNEL + 1}")
 
     def _m3_close_synth(self, key: tuple, state: Module3HandState):
         if state.current_synth_note is None:
             return
         self._enqueue(
-            mido.Message('note_off', note=state.current_synth_note, velocity=0,
-                         channel=M3_SYNTH_CHANNEL),
+            _SYNTH_NOTE_OFF[state.current_synth_note],
             auto_note_off=False
         )
         state.is_sustaining      = False
         state.current_synth_note = None
         if ENABLE_DEBUG_PRINTS:
-            print(f"  SYNTH OFF {key} ch={M3_SYNTH_CHANNEL + 1}")
+            _debug(f"  SYNTH OFF {key} ch={M3_SYNTH_CHANNEL + 1}")
 
     def _m3_fire_drum(self, key: tuple, state: Module3HandState):
         self._enqueue(
-            mido.Message('note_on', note=M3_DRUM_NOTE, velocity=MAX_VELOCITY,
-                         channel=M3_DRUM_CHANNEL),
+            _M3_DRUM_NOTE_ON,
             auto_note_off=True   # sender closes it after 50 ms — no stuck notes
         )
-        state.last_trigger_time = time.time()
+        state.retrigger_deadline = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
         if ENABLE_DEBUG_PRINTS:
-            print(f"  M3 DRUM   {key} ch={M3_DRUM_CHANNEL + 1}")
+            _debug(f"  M3 DRUM   {key} ch={M3_DRUM_CHANNEL + 1}")
 
     def _check_strike_m3(self, state: Module3HandState, current_height: float, key: tuple):
         """Downward-strike detection for the module 3 drum side (ch 6)."""
@@ -550,7 +677,7 @@ class FourModuleListener(leap.Listener):
             state.last_trigger_height = current_height   # track rising peak
             return
         if (state.last_trigger_height - current_height > DOWNWARD_STRIKE_THRESHOLD and
-                time.time() - state.last_trigger_time >= RETRIGGER_COOLDOWN):
+                time.monotonic_ns() >= state.retrigger_deadline):
             self._m3_fire_drum(key, state)
             state.last_trigger_height = current_height   # reset peak after strike
 
@@ -562,51 +689,40 @@ class FourModuleListener(leap.Listener):
             state.last_trigger_height = current_height
             return
         if (state.last_trigger_height - current_height > DOWNWARD_STRIKE_THRESHOLD and
-                time.time() - state.last_trigger_time >= RETRIGGER_COOLDOWN):
+                time.monotonic_ns() >= state.retrigger_deadline):
             self._fire_drum(cfg, key, state)
             state.last_trigger_height = current_height
 
     def _fire_drum(self, cfg: dict, key: tuple, state: TwoZoneHandState):
-        self._enqueue(
-            mido.Message('note_on', note=cfg['note'], velocity=MAX_VELOCITY,
-                         channel=cfg['channel']),
-            auto_note_off=True
-        )
-        state.last_trigger_time = time.time()
+        self._enqueue(cfg['note_on'], auto_note_off=True)
+        state.retrigger_deadline = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
         if ENABLE_DEBUG_PRINTS:
-            print(f"  HIT  {key} → {cfg['name']} ch={cfg['channel'] + 1}")
-
-    # ------------------------------------------------------------------
-    # Spatial helpers
-    # ------------------------------------------------------------------
-
-    def _in_zone(self, pos) -> bool:
-        return (X_RANGE[0] <= pos.x <= X_RANGE[1] and
-                Z_RANGE[0] <= pos.z <= Z_RANGE[1] and
-                pos.y >= Y_MIN)
-
-    def _x_zone(self, pos) -> int | None:
-        """0 = left zone (x < 0),  1 = right zone (x >= 0)."""
-        if not self._in_zone(pos):
-            return None
-        return 0 if pos.x < 0 else 1
+            _debug(f"  HIT  {key} → {cfg['name']} ch={cfg['channel'] + 1}")
 
     # ------------------------------------------------------------------
     # MIDI queue + sender thread
     # ------------------------------------------------------------------
 
-    def _enqueue(self, msg: mido.Message, auto_note_off: bool):
+    def _enqueue(self, data: bytes, auto_note_off: bool):
+        self._pending.append((data, auto_note_off))
+
+    def _flush(self):
+        """Hand every message collected for this frame to the sender as one item."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
         try:
-            self.midi_queue.put_nowait((msg, auto_note_off))
+            self.midi_queue.put_nowait(batch)
         except queue.Full:
             if ENABLE_DEBUG_PRINTS:
-                print("MIDI queue full — dropping message")
+                _debug(f"MIDI queue full — dropping {len(batch)} message(s)")
 
     def _midi_sender(self):
         """
-        Drain the MIDI queue. Each item: (mido.Message, auto_note_off: bool).
+        Drain the MIDI queue. Each item is one frame's batch:
+        a list of (midi_bytes, auto_note_off: bool).
 
-          auto_note_off=True  → send note_on, sleep 50 ms, send note_off.
+          auto_note_off=True  → send note_on; note_off follows 50 ms later.
                                 Every drum hit is self-contained; the Syntakt
                                 cannot be left holding an open note regardless
                                 of what happens next.
@@ -614,75 +730,132 @@ class FourModuleListener(leap.Listener):
                                 Used for synth note_on (sustained until
                                 _m3_close_synth) and for explicit note_off.
         """
+        # rtmidi only takes one short message per send_message call, so a batch
+        # is written message by message through a local-bound writer.
+        send = self._send_bytes
+        # Auto note_offs not yet sent: note_on bytes → monotonic due time.
+        # Scheduling them instead of sleeping after each hit keeps one drum
+        # hit from holding up every message queued behind it for 50 ms.
+        due_offs:  dict[bytes, float] = {}
+        # note_on bytes → matching note_off bytes, built once per distinct note.
+        note_offs: dict[bytes, bytes] = {}
         while True:
+            timeout = 1.0
+            if due_offs:
+                timeout = max(0.0, min(due_offs.values()) - time.monotonic())
             try:
-                item = self.midi_queue.get(timeout=1.0)
-                if item is None:
-                    break
-                msg, auto_note_off = item
-                self.port.send(msg)
-                if auto_note_off and msg.type == 'note_on' and msg.velocity > 0:
-                    time.sleep(0.05)
-                    self.port.send(mido.Message('note_off',
-                        note=msg.note, velocity=0, channel=msg.channel))
+                batch = self.midi_queue.get(timeout=timeout)
             except queue.Empty:
-                continue
+                batch = ()
+            if batch is None:
+                break
+            try:
+                for data, auto_note_off in batch:
+                    if auto_note_off and data[0] & 0xF0 == _NOTE_ON and data[2] > 0:
+                        note_off = note_offs.get(data)
+                        if note_off is None:
+                            note_off = note_offs[data] = bytes(
+                                (_NOTE_OFF | (data[0] & 0x0F), data[1], 0))
+                        # Same note hit again before its off was due (e.g. two
+                        # hands in one zone): close the first hit right before
+                        # the retrigger so every note_on still gets its own off.
+                        if due_offs.pop(data, None) is not None:
+                            send(note_off)
+                        send(data)
+                        due_offs[data] = time.monotonic() + _AUTO_NOTE_OFF_DELAY
+                    else:
+                        send(data)
+                if due_offs:
+                    now = time.monotonic()
+                    for data in [d for d, due in due_offs.items() if due <= now]:
+                        del due_offs[data]
+                        send(note_offs[data])
             except Exception as e:
                 if ENABLE_DEBUG_PRINTS:
-                    print(f"MIDI send error: {e}")
+                    _debug(f"MIDI send error: {e}")
+        # Stopping: close any hit whose off hadn't come due yet.
+        for data in due_offs:
+            try:
+                send(note_offs[data])
+            except Exception:
+                pass
 
     # ------------------------------------------------------------------
-    # Shutdown — all-notes-off panic, then stop sender thread
+    # Shutdown — stop sender thread, then all-notes-off panic
     # ------------------------------------------------------------------
 
     def shutdown(self):
+        # Stop the sender first: it would otherwise be writing to the port
+        # concurrently with the panic below, and anything still queued is
+        # sent before the all-notes-off instead of after it.
+        self.midi_queue.put(None)      # sentinel — tells sender thread to exit
+        self.midi_thread.join(timeout=2.0)
         print("Sending all-notes-off on all 12 channels...")
+        all_notes_off = bytearray((_CONTROL_CHANGE, 123, 0))
         for channel in range(12):
+            all_notes_off[0] = _CONTROL_CHANGE | channel
             try:
-                self.port.send(mido.Message('control_change',
-                    channel=channel, control=123, value=0))
+                self._send_bytes(all_notes_off)
             except Exception:
                 pass
-        self.midi_queue.put(None)      # sentinel — tells sender thread to exit
-        self.midi_thread.join(timeout=2.0)
 
 
 # ---------------------------------------------------------------------------
 # Entry point
 # ---------------------------------------------------------------------------
 
+def _open_midi_out(name: str) -> rtmidi.MidiOut:
+    """Open the rtmidi output port called exactly `name`."""
+    midi_out = rtmidi.MidiOut()
+    ports    = midi_out.get_ports()
+    if name not in ports:
+        raise IOError(f"MIDI port {name!r} not found — available: {ports}")
+    midi_out.open_port(ports.index(name))
+    return midi_out
+
+
+# An untimed Event.wait() can't be interrupted by Ctrl+C on Windows, so the main
+# thread wakes briefly there to let the SIGINT handler run.
+_STOP_POLL = 1.0 if sys.platform == 'win32' else None
+
+
 def main():
     listener = None
+    port     = None
     try:
-        with mido.open_output(MIDI_PORT_NAME) as port:
-            print(f"MIDI port : {port.name}")
-            print(f"Debug     : {'ON' if ENABLE_DEBUG_PRINTS else 'OFF'}")
-            print()
-            print("  Player 1 (1st device) : Ch 1 left / Ch 2 right      [drum]")
-            print("  Player 2 (2nd device) : Ch 3 left / Ch 4 right      [drum]")
-            print("  Player 3 (3rd device) : Ch 6 left drum / Ch 8 right synth")
-            print(f"    Synth scale : C-minor blues, C4–C6, {len(SYNTH_NOTES)} notes")
-            print(f"    Notes       : {SYNTH_NOTES}")
-            print("    Pitch map   : |z| 0 mm → C6 (high)  |  200 mm → C4 (low)")
-            print("  Player 4 (4th device) : Ch 11 left / Ch 12 right    [drum]")
-            print()
-            print("Waiting for Ultraleap devices...\n")
-
-            device_stack = contextlib.ExitStack()
-            connection   = leap.Connection(multi_device_aware=True)
-            listener     = FourModuleListener(port, device_stack, connection)
-            connection.add_listener(listener)
-
-            with device_stack:
-                with connection.open():
-                    connection.set_tracking_mode(leap.TrackingMode.Desktop)
-                    print("Ready — Ctrl+C to exit\n")
-                    last_health = time.time()
-                    while True:
-                        time.sleep(1)
-                        if time.time() - last_health >= 10.0:
-                            listener.print_health()
-                            last_health = time.time()
+        port = _open_midi_out(MIDI_PORT_NAME)
+        print(f"MIDI port : {MIDI_PORT_NAME}")
+        print(f"Debug     : {'ON' if ENABLE_DEBUG_PRINTS else 'OFF'}")
+        print()
+        print("  Player 1 (1st device) : Ch 1 left / Ch 2 right      [drum]")
+        print("  Player 2 (2nd device) : Ch 3 left / Ch 4 right      [drum]")
+        print("  Player 3 (3rd device) : Ch 6 left drum / Ch 8 right synth")
+        print(f"    Synth scale : C-minor blues, C4–C6, {len(SYNTH_NOTES)} notes")
+        print(f"    Notes       : {SYNTH_NOTES}")
+        print("    Pitch map   : |z| 0 mm → C6 (high)  |  200 mm → C4 (low)")
+        print("  Player 4 (4th device) : Ch 11 left / Ch 12 right    [drum]")
+        print()
+        print("Waiting for Ultraleap devices...\n")
+
+        device_stack = contextlib.ExitStack()
+        connection   = leap.Connection(multi_device_aware=True)
+        listener     = FourModuleListener(port, device_stack, connection)
+        connection.add_listener(listener)
+
+        with device_stack:
+            with connection.open():
+                connection.set_tracking_mode(leap.TrackingMode.Desktop)
+                stop = threading.Event()
+                # Ctrl+C just sets the event, so the device stack and the
+                # connection close in order before listener.shutdown().
+                signal.signal(signal.SIGINT, lambda *_: stop.set())
+                print("Ready — Ctrl+C to exit\n")
+                last_health = time.time()
+                while not stop.wait(_STOP_POLL or 10.0):
+                    if time.time() - last_health >= 10.0:
+                        listener.print_health()
+                        last_health = time.time()
+                print("\nShutting down...")
 
     except KeyboardInterrupt:
         print("\nShutting down...")
@@ -691,8 +864,12 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        # Shut down before closing the port so the all-notes-off panic
+        # actually reaches the Syntakt.
         if listener:
             listener.shutdown()
+        if port is not None:
+            port.close_port()
 
 
 if __name__ == "__main__":
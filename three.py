@@ -23,9 +23,11 @@ SYNTAKT SETUP
 import contextlib
 import leap
 import time
-import mido
+import rtmidi
 import threading
 import queue
+import signal
+import sys
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -34,18 +36,44 @@ import queue
 MIDI_PORT_NAME      = 'USB MIDI Interface 1'
 ENABLE_DEBUG_PRINTS = False
 
+# Max gesture-processing rate per device (Hz); earlier frames are skipped
+MAX_TRACKING_HZ    = 60
+_FRAME_INTERVAL_NS = 1_000_000_000 // MAX_TRACKING_HZ
+
 # Play zone (mm, relative to each module's center)
 X_RANGE = [-400, 400]
 Z_RANGE = [-400, 400]
 Y_MIN   = 50
 Y_MAX   = 500   # upper bound for melodic height mapping
 
+# Unpacked once so the per-frame zone test compares plain numbers.
+_X_MIN, _X_MAX = X_RANGE
+_Z_MIN, _Z_MAX = Z_RANGE
+
+# Melodic re-pitch deadband: the hand must travel this far (mm) past a note
+# band's edge before the held note changes, so a hand resting on a boundary
+# doesn't flap between two notes every frame.
+NOTE_HYSTERESIS = 4.0
+
 # Strike detection
 DOWNWARD_STRIKE_THRESHOLD = 50.0
 OPEN_HAND_THRESHOLD       = 0.20
 RETRIGGER_COOLDOWN        = 0.1190
 MAX_VELOCITY              = 127
 
+# Cooldown as integer nanoseconds: strikes compare time.monotonic_ns() against a
+# per-hand deadline, which is immune to wall-clock adjustments.
+_RETRIGGER_COOLDOWN_NS = int(RETRIGGER_COOLDOWN * 1e9)
+
+# MIDI status bytes (high nibble; low nibble is the 0-indexed channel)
+_NOTE_ON        = 0x90
+_NOTE_OFF       = 0x80
+_CONTROL_CHANGE = 0xB0
+
+# Gap between a drum note_on and its automatic note_off. Every hit needs its
+# own note_off or the Syntakt holds the voice open (see CLAUDE.md).
+_AUTO_NOTE_OFF_DELAY = 0.05
+
 # ---------------------------------------------------------------------------
 # Scale bank and note names (for Ch 8 melodic setup)
 # ---------------------------------------------------------------------------
@@ -56,38 +84,38 @@ NOTE_NAMES: dict[str, int] = {
     'Ab': 8, 'A': 9, 'A#': 10, 'Bb': 10, 'B': 11,
 }
 
-SCALES: dict[str, list[int]] = {
-    'major':            [0, 2, 4, 5, 7, 9, 11],
-    'minor':            [0, 2, 3, 5, 7, 8, 10],
-    'dorian':           [0, 2, 3, 5, 7, 9, 10],
-    'phrygian':         [0, 1, 3, 5, 7, 8, 10],
-    'lydian':           [0, 2, 4, 6, 7, 9, 11],
-    'mixolydian':       [0, 2, 4, 5, 7, 9, 10],
-    'locrian':          [0, 1, 3, 5, 6, 8, 10],
-    'harmonic_minor':   [0, 2, 3, 5, 7, 8, 11],
-    'melodic_minor':    [0, 2, 3, 5, 7, 9, 11],
-    'pentatonic_major': [0, 2, 4, 7, 9],
-    'pentatonic_minor': [0, 3, 5, 7, 10],
-    'blues_major':      [0, 2, 3, 4, 7, 9],
-    'blues_minor':      [0, 3, 5, 6, 7, 10],
-    'whole_tone':       [0, 2, 4, 6, 8, 10],
-    'hirajoshi':        [0, 2, 3, 7, 8],
-    'in_sen':           [0, 1, 5, 7, 10],
-    'iwato':            [0, 1, 5, 6, 10],
-    'hungarian_minor':  [0, 2, 3, 6, 7, 8, 11],
-    'phrygian_dominant':[0, 1, 4, 5, 7, 8, 10],
-    'persian':          [0, 1, 4, 5, 6, 8, 11],
+SCALES: dict[str, tuple[int, ...]] = {
+    'major':            (0, 2, 4, 5, 7, 9, 11),
+    'minor':            (0, 2, 3, 5, 7, 8, 10),
+    'dorian':           (0, 2, 3, 5, 7, 9, 10),
+    'phrygian':         (0, 1, 3, 5, 7, 8, 10),
+    'lydian':           (0, 2, 4, 6, 7, 9, 11),
+    'mixolydian':       (0, 2, 4, 5, 7, 9, 10),
+    'locrian':          (0, 1, 3, 5, 6, 8, 10),
+    'harmonic_minor':   (0, 2, 3, 5, 7, 8, 11),
+    'melodic_minor':    (0, 2, 3, 5, 7, 9, 11),
+    'pentatonic_major': (0, 2, 4, 7, 9),
+    'pentatonic_minor': (0, 3, 5, 7, 10),
+    'blues_major':      (0, 2, 3, 4, 7, 9),
+    'blues_minor':      (0, 3, 5, 6, 7, 10),
+    'whole_tone':       (0, 2, 4, 6, 8, 10),
+    'hirajoshi':        (0, 2, 3, 7, 8),
+    'in_sen':           (0, 1, 5, 7, 10),
+    'iwato':            (0, 1, 5, 6, 10),
+    'hungarian_minor':  (0, 2, 3, 6, 7, 8, 11),
+    'phrygian_dominant':(0, 1, 4, 5, 7, 8, 10),
+    'persian':          (0, 1, 4, 5, 6, 8, 11),
 }
 
 # Populated at startup by prompt_melodic_config(); read by _height_to_note()
-MELODIC_NOTES: list[int] = []
+MELODIC_NOTES: tuple[int, ...] = ()
 
 # ---------------------------------------------------------------------------
 # Per-module channel assignments
-# mido channels are 0-indexed: channel=0 → Syntakt MIDI Ch 1
+# Channels are the 0-indexed low nibble of the status byte: channel=0 → Syntakt MIDI Ch 1
 #
 # Each zone dict:
-#   channel  : mido 0-indexed channel
+#   channel  : 0-indexed channel (status-byte low nibble)
 #   note     : MIDI note (drums only; tonal mode ignores this)
 #   name     : display label
 #   tonal    : True → sustain/height-mapped melody; False → drum impulse
@@ -108,6 +136,19 @@ MODULE_CONFIG: dict[int, list[dict]] = {
     ],
 }
 
+# A drum zone always sends the same note_on, so encode it once up front.
+# (Tonal zones pick their note from hand height at trigger time.)
+for _zones in MODULE_CONFIG.values():
+    for _cfg in _zones:
+        _cfg['note_on'] = bytes((_NOTE_ON | _cfg['channel'], _cfg['note'], MAX_VELOCITY))
+
+# Each module's per-zone 'tonal' flags as a tuple: the hand loop branches on the
+# zone's mode every frame, and a tuple index beats a dict lookup on the cfg.
+_MODULE_TONAL: dict[int, tuple[bool, ...]] = {
+    player: tuple(cfg['tonal'] for cfg in zones)
+    for player, zones in MODULE_CONFIG.items()
+}
+
 # ---------------------------------------------------------------------------
 # Hand state
 # ---------------------------------------------------------------------------
@@ -115,7 +156,7 @@ MODULE_CONFIG: dict[int, list[dict]] = {
 class HandState:
     __slots__ = [
         'hand_id', 'is_active', 'current_zone',
-        'last_trigger_height', 'last_trigger_time',
+        'last_trigger_height', 'retrigger_deadline',
         'is_sustaining', 'current_note', 'current_channel',
     ]
 
@@ -124,7 +165,7 @@ class HandState:
         self.is_active           = False
         self.current_zone        = None
         self.last_trigger_height = 0.0
-        self.last_trigger_time   = 0.0
+        self.retrigger_deadline  = 0
         self.is_sustaining       = False
         self.current_note        = None
         self.current_channel     = None
@@ -133,22 +174,53 @@ class HandState:
         self.is_active           = True
         self.current_zone        = zone
         self.last_trigger_height = height
-        self.last_trigger_time   = time.time()
+        self.retrigger_deadline  = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
 
     def deactivate(self):
         self.is_active    = False
         self.current_zone = None
 
 
+# ---------------------------------------------------------------------------
+# Debug output
+# ---------------------------------------------------------------------------
+
+# Queued for the printer thread — see "Debug mode" in CLAUDE.md
+_debug_lines: queue.SimpleQueue = queue.SimpleQueue()
+
+
+def _debug(msg: str):
+    _debug_lines.put(msg)
+
+
+def _debug_printer():
+    while True:
+        print(_debug_lines.get())
+
+
 # ---------------------------------------------------------------------------
 # Listener
 # ---------------------------------------------------------------------------
 
 class ThreeModuleListener(leap.Listener):
+    """
+    MIDI queue items are per-frame batches: lists of (midi_bytes, auto_note_off: bool).
+    A batch is queued (or dropped, if the queue is full) as a unit.
+    """
+
+    # Every instance attribute — keep in sync with __init__
+    __slots__ = [
+        'port', '_send_bytes', '_device_stack', '_connection',
+        '_device_map', '_device_map_lock', '_serial_to_player', '_device_serials',
+        '_opened_device_ids', '_player_last_seen', '_next_frame_ns',
+        '_hand_states', '_notes', '_note_lut', '_note_lut_max',
+        '_tonal_on', '_tonal_off', '_pending', 'midi_queue', 'midi_thread',
+    ]
 
     def __init__(self, port, device_stack, connection):
         super().__init__()
         self.port          = port
+        self._send_bytes   = port.send_message   # pre-bound rtmidi.MidiOut write
         self._device_stack = device_stack
         self._connection   = connection
 
@@ -158,12 +230,46 @@ class ThreeModuleListener(leap.Listener):
         self._device_serials:   dict[int, str] = {}
         self._opened_device_ids: set[int]      = set()
         self._player_last_seen:  dict[int, float] = {}
+        self._next_frame_ns:     dict[int, int]   = {}
+
+        # device_id → {hand.id → HandState}. Hand IDs can collide across
+        # devices, so each device gets its own dict.
+        self._hand_states: dict[int, dict[int, HandState]] = {}
+
+        # _height_to_note table — MELODIC_NOTES is fixed before the listener is
+        # built, so the note for every whole mm from Y_MIN to Y_MAX is
+        # computed once here and a lookup is an index into it.
+        self._notes        = MELODIC_NOTES
+        note_scale         = len(MELODIC_NOTES) / (Y_MAX - Y_MIN)
+        note_max_i         = len(MELODIC_NOTES) - 1
+        self._note_lut     = tuple(
+            MELODIC_NOTES[min(int(mm * note_scale), note_max_i)]
+            for mm in range(Y_MAX - Y_MIN + 1)
+        )
+        self._note_lut_max = len(self._note_lut) - 1
+
+        # Encoded note_on / note_off for every melodic note on every tonal
+        # channel (channel → note → bytes), so a tonal trigger is a lookup.
+        tonal_channels = {cfg['channel'] for zones in MODULE_CONFIG.values()
+                          for cfg in zones if cfg['tonal']}
+        self._tonal_on: dict[int, dict[int, bytes]] = {
+            ch: {n: bytes((_NOTE_ON | ch, n, MAX_VELOCITY)) for n in MELODIC_NOTES}
+            for ch in tonal_channels
+        }
+        self._tonal_off: dict[int, dict[int, bytes]] = {
+            ch: {n: bytes((_NOTE_OFF | ch, n, 0)) for n in MELODIC_NOTES}
+            for ch in tonal_channels
+        }
 
-        self._hand_states: dict[tuple, HandState] = {}
+        # Messages produced while handling one tracking frame (or one device loss)
+        # are collected here and handed to the sender as a single queue item.
+        self._pending: list[tuple[bytes, bool]] = []
 
         self.midi_queue  = queue.Queue(maxsize=200)
         self.midi_thread = threading.Thread(target=self._midi_sender, daemon=True)
         self.midi_thread.start()
+        if ENABLE_DEBUG_PRINTS:
+            threading.Thread(target=_debug_printer, daemon=True).start()
 
     # ------------------------------------------------------------------
     # Device lifecycle
@@ -203,13 +309,13 @@ class ThreeModuleListener(leap.Listener):
 
         with self._device_map_lock:
             self._opened_device_ids.discard(device_id)
+            self._next_frame_ns.pop(device_id, None)
             player = self._device_map.pop(device_id, None)
 
-        for k in [k for k in self._hand_states if k[0] == device_id]:
-            state = self._hand_states[k]
+        for state in self._hand_states.pop(device_id, {}).values():
             if state.is_sustaining:
                 self._release_tonal(state)
-            del self._hand_states[k]
+        self._flush()
 
         if player is not None:
             print(f"[Device] id={device_id} LOST (was Player {player}) — "
@@ -256,33 +362,55 @@ class ThreeModuleListener(leap.Listener):
 
     def on_tracking_event(self, event):
         device_id = event.metadata.device_id
-        player    = self._get_player(device_id)
+        # Per-device rate cap (MAX_TRACKING_HZ)
+        now = time.monotonic_ns()
+        due = self._next_frame_ns.get(device_id, 0)
+        if now < due:
+            return
+        due += _FRAME_INTERVAL_NS   # one interval on; resync from now after a gap
+        self._next_frame_ns[device_id] = due if due > now else now + _FRAME_INTERVAL_NS
+
+        player = self._get_player(device_id)
         if player is None:
             return
 
         self._player_last_seen[player] = time.time()
-        self._process(device_id, event.hands, MODULE_CONFIG[player])
-
-    def _process(self, device_id: int, hands, config: list):
-        current_keys = {(device_id, h.id) for h in hands}
+        self._process(device_id, event.hands, MODULE_CONFIG[player], _MODULE_TONAL[player])
+        self._flush()
+
+    def _process(self, device_id: int, hands, config: list, tonal: tuple):
+        # This device's hands, keyed by hand.id.
+        hand_states = self._hand_states.get(device_id)
+        if hand_states is None:
+            hand_states = self._hand_states[device_id] = {}
+
+        # Per-frame constants as locals for the hand loop
+        open_thr     = OPEN_HAND_THRESHOLD
+        x_min, x_max = _X_MIN, _X_MAX
+        z_min, z_max = _Z_MIN, _Z_MAX
+        y_min        = Y_MIN
+        current_ids  = set()   # filled in the hand loop — no separate pass
 
         for hand in hands:
             pos     = hand.palm.position
-            key     = (device_id, hand.id)
-            in_zone = self._in_zone(pos)
-            is_open = hand.grab_strength < OPEN_HAND_THRESHOLD
-            zone    = self._x_zone(pos) if in_zone else None
-
-            if key not in self._hand_states:
-                self._hand_states[key] = HandState(hand.id)
-            state = self._hand_states[key]
+            x, y, z = pos.x, pos.y, pos.z
+            hand_id = hand.id
+            key     = (device_id, hand_id)
+            current_ids.add(hand_id)
+            in_zone = x_min <= x <= x_max and z_min <= z <= z_max and y >= y_min
+            is_open = hand.grab_strength < open_thr
+            zone    = (0 if x < 0 else 1) if in_zone else None   # 0=left, 1=right
+
+            state = hand_states.get(hand_id)
+            if state is None:
+                state = hand_states[hand_id] = HandState(hand_id)
 
             if not state.is_active:
                 if in_zone and is_open and zone is not None:
-                    state.activate(zone, pos.y)
+                    state.activate(zone, y)
                     cfg = config[zone]
-                    if cfg['tonal']:
-                        self._fire_tonal(cfg, pos.y, key, state)
+                    if tonal[zone]:
+                        self._fire_tonal(cfg, y, key, state)
                     else:
                         self._fire(cfg, key, state)
 
@@ -292,23 +420,22 @@ class ThreeModuleListener(leap.Listener):
                     if state.is_sustaining:
                         self._release_tonal(state)
                     state.current_zone        = zone
-                    state.last_trigger_height = pos.y
+                    state.last_trigger_height = y
                     cfg = config[zone]
-                    if cfg['tonal']:
-                        self._fire_tonal(cfg, pos.y, key, state)
+                    if tonal[zone]:
+                        self._fire_tonal(cfg, y, key, state)
                     else:
                         self._fire(cfg, key, state)
 
                 elif zone is not None:
                     cfg = config[zone]
-                    if cfg['tonal']:
+                    if tonal[zone]:
                         # Retrigger only when the mapped note changes
-                        new_note = self._height_to_note(pos.y)
-                        if new_note != state.current_note:
+                        if self._note_moved(y, state.current_note):
                             self._release_tonal(state)
-                            self._fire_tonal(cfg, pos.y, key, state)
+                            self._fire_tonal(cfg, y, key, state)
                     else:
-                        self._check_strike(state, pos.y, cfg, key)
+                        self._check_strike(state, y, cfg, key)
 
             else:
                 # Zone exit or fist close
@@ -316,12 +443,12 @@ class ThreeModuleListener(leap.Listener):
                     self._release_tonal(state)
                 state.deactivate()
 
-        stale = {k for k in self._hand_states if k[0] == device_id} - current_keys
-        for k in stale:
-            state = self._hand_states[k]
-            if state.is_sustaining:
-                self._release_tonal(state)
-            del self._hand_states[k]
+        # Every hand seen this frame has a state, so equal sizes mean none went stale.
+        if len(hand_states) != len(current_ids):
+            for hand_id in hand_states.keys() - current_ids:
+                state = hand_states.pop(hand_id)
+                if state.is_sustaining:
+                    self._release_tonal(state)
 
     # ------------------------------------------------------------------
     # Gesture + MIDI helpers
@@ -333,92 +460,127 @@ class ThreeModuleListener(leap.Listener):
             state.last_trigger_height = current_height
             return
         if (state.last_trigger_height - current_height > DOWNWARD_STRIKE_THRESHOLD and
-                time.time() - state.last_trigger_time >= RETRIGGER_COOLDOWN):
+                time.monotonic_ns() >= state.retrigger_deadline):
             self._fire(cfg, key, state)
             state.last_trigger_height = current_height
 
     def _fire(self, cfg: dict, key: tuple, state: HandState):
-        self._enqueue(
-            mido.Message('note_on', note=cfg['note'],
-                         velocity=MAX_VELOCITY, channel=cfg['channel']),
-            auto_note_off=True
-        )
-        state.last_trigger_time = time.time()
+        self._enqueue(cfg['note_on'], auto_note_off=True)
+        state.retrigger_deadline = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
         if ENABLE_DEBUG_PRINTS:
-            print(f"  HIT {key} → {cfg['name']} ch={cfg['channel'] + 1}")
+            _debug(f"  HIT {key} → {cfg['name']} ch={cfg['channel'] + 1}")
 
     def _fire_tonal(self, cfg: dict, y: float, key: tuple, state: HandState):
         note = self._height_to_note(y)
         self._enqueue(
-            mido.Message('note_on', note=note,
-                         velocity=MAX_VELOCITY, channel=cfg['channel']),
+            self._tonal_on[cfg['channel']][note],
             auto_note_off=False
         )
         state.is_sustaining   = True
         state.current_note    = note
         state.current_channel = cfg['channel']
-        state.last_trigger_time = time.time()
+        state.retrigger_deadline = time.monotonic_ns() + _RETRIGGER_COOLDOWN_NS
         if ENABLE_DEBUG_PRINTS:
-            print(f"  TONAL ON  {key} → {cfg['name']} note={note} ch={cfg['channel']+1}")
+            _debug(f"  TONAL ON  {key} → {cfg['name']} note={note} ch={cfg['channel']+1}")
 
     def _release_tonal(self, state: HandState):
         if state.current_note is not None and state.current_channel is not None:
             self._enqueue(
-                mido.Message('note_off', note=state.current_note,
-                             velocity=0, channel=state.current_channel),
+                self._tonal_off[state.current_channel][state.current_note],
                 auto_note_off=False
             )
             if ENABLE_DEBUG_PRINTS:
-                print(f"  TONAL OFF note={state.current_note} ch={state.current_channel+1}")
+                _debug(f"  TONAL OFF note={state.current_note} ch={state.current_channel+1}")
         state.is_sustaining   = False
         state.current_note    = None
         state.current_channel = None
 
     def _height_to_note(self, y: float) -> int:
         """Map hand height (mm) to a MIDI note in MELODIC_NOTES."""
-        y_clamped = max(float(Y_MIN), min(float(Y_MAX), y))
-        ratio     = (y_clamped - Y_MIN) / (Y_MAX - Y_MIN)
-        idx       = min(int(ratio * len(MELODIC_NOTES)), len(MELODIC_NOTES) - 1)
-        return MELODIC_NOTES[idx]
-
-    def _in_zone(self, pos) -> bool:
-        return (X_RANGE[0] <= pos.x <= X_RANGE[1] and
-                Z_RANGE[0] <= pos.z <= Z_RANGE[1] and
-                pos.y >= Y_MIN)
-
-    def _x_zone(self, pos) -> int | None:
-        if not self._in_zone(pos):
-            return None
-        return 0 if pos.x < 0 else 1
+        idx   = int(y) - Y_MIN
+        max_i = self._note_lut_max
+        return self._note_lut[0 if idx < 0 else (max_i if idx > max_i else idx)]
+
+    def _note_moved(self, y: float, current_note: int | None) -> bool:
+        """True once y is NOTE_HYSTERESIS mm past the edge of current_note's band."""
+        # Above Y_MAX the mapping is pinned to the top note — nothing to remap.
+        if y >= Y_MAX and current_note == self._notes[-1]:
+            return False
+        new_note = self._height_to_note(y)
+        if current_note is None or new_note == current_note:
+            return new_note != current_note
+        # Notes rise with height — look back toward the band the hand came from.
+        back = NOTE_HYSTERESIS if new_note > current_note else -NOTE_HYSTERESIS
+        return self._height_to_note(y - back) != current_note
 
     # ------------------------------------------------------------------
     # MIDI sender thread
     # ------------------------------------------------------------------
 
-    def _enqueue(self, msg: mido.Message, auto_note_off: bool):
+    def _enqueue(self, data: bytes, auto_note_off: bool):
+        self._pending.append((data, auto_note_off))
+
+    def _flush(self):
+        """Hand every message collected for this frame to the sender as one item."""
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
         try:
-            self.midi_queue.put_nowait((msg, auto_note_off))
+            self.midi_queue.put_nowait(batch)
         except queue.Full:
             if ENABLE_DEBUG_PRINTS:
-                print("MIDI queue full — dropping message")
+                _debug(f"MIDI queue full — dropping {len(batch)} message(s)")
 
     def _midi_sender(self):
+        # rtmidi only takes one short message per send_message call, so a batch
+        # is written message by message through a local-bound writer.
+        send = self._send_bytes
+        # Auto note_offs not yet sent: note_on bytes → monotonic due time.
+        # Scheduling them instead of sleeping after each hit keeps one drum
+        # hit from holding up every message queued behind it for 50 ms.
+        due_offs:  dict[bytes, float] = {}
+        # note_on bytes → matching note_off bytes, built once per distinct note.
+        note_offs: dict[bytes, bytes] = {}
         while True:
+            timeout = 1.0
+            if due_offs:
+                timeout = max(0.0, min(due_offs.values()) - time.monotonic())
             try:
-                item = self.midi_queue.get(timeout=1.0)
-                if item is None:
-                    break
-                msg, auto_note_off = item
-                self.port.send(msg)
-                if auto_note_off and msg.type == 'note_on' and msg.velocity > 0:
-                    time.sleep(0.05)
-                    self.port.send(mido.Message('note_off',
-                        note=msg.note, velocity=0, channel=msg.channel))
+                batch = self.midi_queue.get(timeout=timeout)
             except queue.Empty:
-                continue
+                batch = ()
+            if batch is None:
+                break
+            try:
+                for data, auto_note_off in batch:
+                    if auto_note_off and data[0] & 0xF0 == _NOTE_ON and data[2] > 0:
+                        note_off = note_offs.get(data)
+                        if note_off is None:
+                            note_off = note_offs[data] = bytes(
+                                (_NOTE_OFF | (data[0] & 0x0F), data[1], 0))
+                        # Same note hit again before its off was due (e.g. two
+                        # hands in one zone): close the first hit right before
+                        # the retrigger so every note_on still gets its own off.
+                        if due_offs.pop(data, None) is not None:
+                            send(note_off)
+                        send(data)
+                        due_offs[data] = time.monotonic() + _AUTO_NOTE_OFF_DELAY
+                    else:
+                        send(data)
+                if due_offs:
+                    now = time.monotonic()
+                    for data in [d for d, due in due_offs.items() if due <= now]:
+                        del due_offs[data]
+                        send(note_offs[data])
             except Exception as e:
                 if ENABLE_DEBUG_PRINTS:
-                    print(f"MIDI send error: {e}")
+                    _debug(f"MIDI send error: {e}")
+        # Stopping: close any hit whose off hadn't come due yet.
+        for data in due_offs:
+            try:
+                send(note_offs[data])
+            except Exception:
+                pass
 
     # ------------------------------------------------------------------
     # Health + shutdown
@@ -443,23 +605,27 @@ class ThreeModuleListener(leap.Listener):
         print()
 
     def shutdown(self):
+        # Stop the sender first: it would otherwise be writing to the port
+        # concurrently with the panic below, and anything still queued is
+        # sent before the all-notes-off instead of after it.
+        self.midi_queue.put(None)
+        self.midi_thread.join(timeout=2.0)
         print("Sending all-notes-off on all 12 channels...")
+        all_notes_off = bytearray((_CONTROL_CHANGE, 123, 0))
         for channel in range(12):
+            all_notes_off[0] = _CONTROL_CHANGE | channel
             try:
-                self.port.send(mido.Message('control_change',
-                    channel=channel, control=123, value=0))
+                self._send_bytes(all_notes_off)
             except Exception:
                 pass
-        self.midi_queue.put(None)
-        self.midi_thread.join(timeout=2.0)
 
 
 # ---------------------------------------------------------------------------
 # Melodic config prompt
 # ---------------------------------------------------------------------------
 
-def prompt_melodic_config() -> list[int]:
-    """Ask for root key and scale; return sorted list of MIDI notes (3 octaves)."""
+def prompt_melodic_config() -> tuple[int, ...]:
+    """Ask for root key and scale; return sorted tuple of MIDI notes (3 octaves)."""
     print("=== Channel 8 — Melodic Setup ===")
     print(f"Scales: {', '.join(sorted(SCALES.keys()))}")
     print()
@@ -480,12 +646,12 @@ def prompt_melodic_config() -> list[int]:
 
     # 3 octaves starting from the root at octave 3 (MIDI 48 = C3)
     base  = 48 + root_semitone
-    notes = sorted({
+    notes = tuple(sorted({
         base + octave * 12 + interval
         for octave in range(3)
         for interval in intervals
         if 0 <= base + octave * 12 + interval <= 127
-    })
+    }))
 
     print(f"\n  {raw} {name} — {len(notes)} notes, "
           f"MIDI {notes[0]}–{notes[-1]}: {notes}")
@@ -497,37 +663,57 @@ def prompt_melodic_config() -> list[int]:
 # Entry point
 # ---------------------------------------------------------------------------
 
+def _open_midi_out(name: str) -> rtmidi.MidiOut:
+    """Open the rtmidi output port called exactly `name`."""
+    midi_out = rtmidi.MidiOut()
+    ports    = midi_out.get_ports()
+    if name not in ports:
+        raise IOError(f"MIDI port {name!r} not found — available: {ports}")
+    midi_out.open_port(ports.index(name))
+    return midi_out
+
+
+# An untimed Event.wait() can't be interrupted by Ctrl+C on Windows, so the main
+# thread wakes briefly there to let the SIGINT handler run.
+_STOP_POLL = 1.0 if sys.platform == 'win32' else None
+
+
 def main():
     global MELODIC_NOTES
     MELODIC_NOTES = prompt_melodic_config()
 
     listener = None
+    port     = None
     try:
-        with mido.open_output(MIDI_PORT_NAME) as port:
-            print(f"MIDI port : {port.name}")
-            print(f"Debug     : {'ON' if ENABLE_DEBUG_PRINTS else 'OFF'}")
-            print()
-            print("  Player 1 (1st device) : Ch 1 left  / Ch 3 right   [drum / drum]")
-            print("  Player 2 (2nd device) : Ch 2 left  / Ch 4 right   [drum / drum]")
-            print("  Player 3 (3rd device) : Ch 8 left  / Ch 12 right  [melodic / drum]")
-            print()
-            print("Waiting for Ultraleap devices...\n")
-
-            device_stack = contextlib.ExitStack()
-            connection   = leap.Connection(multi_device_aware=True)
-            listener     = ThreeModuleListener(port, device_stack, connection)
-            connection.add_listener(listener)
-
-            with device_stack:
-                with connection.open():
-                    connection.set_tracking_mode(leap.TrackingMode.Desktop)
-                    print("Ready — Ctrl+C to exit\n")
-                    last_health = time.time()
-                    while True:
-                        time.sleep(1)
-                        if time.time() - last_health >= 10.0:
-                            listener.print_health()
-                            last_health = time.time()
+        port = _open_midi_out(MIDI_PORT_NAME)
+        print(f"MIDI port : {MIDI_PORT_NAME}")
+        print(f"Debug     : {'ON' if ENABLE_DEBUG_PRINTS else 'OFF'}")
+        print()
+        print("  Player 1 (1st device) : Ch 1 left  / Ch 3 right   [drum / drum]")
+        print("  Player 2 (2nd device) : Ch 2 left  / Ch 4 right   [drum / drum]")
+        print("  Player 3 (3rd device) : Ch 8 left  / Ch 12 right  [melodic / drum]")
+        print()
+        print("Waiting for Ultraleap devices...\n")
+
+        device_stack = contextlib.ExitStack()
+        connection   = leap.Connection(multi_device_aware=True)
+        listener     = ThreeModuleListener(port, device_stack, connection)
+        connection.add_listener(listener)
+
+        with device_stack:
+            with connection.open():
+                connection.set_tracking_mode(leap.TrackingMode.Desktop)
+                stop = threading.Event()
+                # Ctrl+C just sets the event, so the device stack and the
+                # connection close in order before listener.shutdown().
+                signal.signal(signal.SIGINT, lambda *_: stop.set())
+                print("Ready — Ctrl+C to exit\n")
+                last_health = time.time()
+                while not stop.wait(_STOP_POLL or 10.0):
+                    if time.time() - last_health >= 10.0:
+                        listener.print_health()
+                        last_health = time.time()
+                print("\nShutting down...")
 
     except KeyboardInterrupt:
         print("\nShutting down...")
@@ -536,8 +722,12 @@ def main():
         import traceback
         traceback.print_exc()
     finally:
+        # Shut down before closing the port so the all-notes-off panic
+        # actually reaches the Syntakt.
         if listener:
             listener.shutdown()
+        if port is not None:
+            port.close_port()
 
 
 if __name__ == "__main__":